@@ -0,0 +1,154 @@
+"""Archivo en frío de ventas antiguas.
+
+Las ventas anteriores al horizonte configurado se guardan en archivos mensuales
+JSONL comprimidos (`ventas-AAAA-MM.jsonl.gz`) y se eliminan de las tablas. Cada
+ejecución agrega un nuevo miembro gzip al final del archivo del mes, por lo que
+los archivos solo crecen. `indice.jsonl` registra para cada `id_venta` el
+archivo y la posición del miembro que la contiene.
+
+Uso:
+    python -m app.archivo
+"""
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+import gzip
+import json
+import os
+import threading
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session, selectinload
+
+from app import schemas, models
+
+# Cargar variables de entorno
+load_dotenv()
+
+ARCHIVO_DIR = os.getenv("ARCHIVO_VENTAS_DIR", "archivo_ventas")
+ARCHIVO_MESES = int(os.getenv("ARCHIVO_VENTAS_MESES", "12"))
+ARCHIVO_LOTE = int(os.getenv("ARCHIVO_VENTAS_LOTE", "500"))
+INDICE = "indice.jsonl"
+
+_indice: Dict[int, Tuple[str, int]] = {}
+_indice_pos = 0
+_indice_lock = threading.Lock()
+
+
+def limite_archivo(meses: int = ARCHIVO_MESES, ahora: Optional[datetime] = None) -> datetime:
+    """Primer día del mes que queda `meses` meses antes del actual"""
+    ahora = ahora or datetime.now(timezone.utc)
+    total = ahora.year * 12 + ahora.month - 1 - meses
+    return datetime(total // 12, total % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _agregar_miembro(mes: str, ventas: list) -> Dict[int, Tuple[str, int]]:
+    """Agrega las ventas como un nuevo miembro gzip del archivo del mes"""
+    nombre = f"ventas-{mes}.jsonl.gz"
+    ruta = os.path.join(ARCHIVO_DIR, nombre)
+    with open(ruta, "ab") as f:
+        offset = f.tell()
+        with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+            for venta in ventas:
+                linea = json.dumps(
+                    schemas.Venta.model_validate(venta).model_dump(mode="json"))
+                gz.write(linea.encode("utf-8") + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return {venta.id_venta: (nombre, offset) for venta in ventas}
+
+
+def _agregar_indice(entradas: Dict[int, Tuple[str, int]]) -> None:
+    with open(os.path.join(ARCHIVO_DIR, INDICE), "a", encoding="utf-8") as f:
+        for id_venta, (nombre, offset) in entradas.items():
+            f.write(json.dumps(
+                {"id_venta": id_venta, "archivo": nombre, "offset": offset}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def archivar_ventas(db: Session, limite: Optional[datetime] = None) -> int:
+    """Mueve al archivo las ventas anteriores a `limite`, por lotes
+
+    Cada lote se escribe en disco antes de borrarse de la base de datos; si el
+    proceso se interrumpe entre ambos pasos, la siguiente ejecución vuelve a
+    archivar esas ventas y el índice apunta a la copia más reciente.
+    """
+    limite = limite or limite_archivo()
+    os.makedirs(ARCHIVO_DIR, exist_ok=True)
+    archivadas = 0
+
+    while True:
+        ventas = db.query(models.Venta).options(
+            selectinload(models.Venta.detalles)).filter(
+            models.Venta.fecha_venta < limite).order_by(
+            models.Venta.id_venta).limit(ARCHIVO_LOTE).all()
+        if not ventas:
+            break
+
+        por_mes = {}
+        for venta in ventas:
+            por_mes.setdefault(venta.fecha_venta.strftime("%Y-%m"), []).append(venta)
+
+        entradas = {}
+        for mes, ventas_mes in por_mes.items():
+            entradas.update(_agregar_miembro(mes, ventas_mes))
+        _agregar_indice(entradas)
+
+        ids = [venta.id_venta for venta in ventas]
+        db.query(models.DetalleVenta).filter(
+            models.DetalleVenta.id_venta.in_(ids)).delete(synchronize_session=False)
+        db.query(models.Venta).filter(
+            models.Venta.id_venta.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+        archivadas += len(ids)
+
+    return archivadas
+
+
+def _actualizar_indice() -> None:
+    """Lee solo las entradas agregadas al índice desde la última lectura"""
+    global _indice_pos
+    ruta = os.path.join(ARCHIVO_DIR, INDICE)
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        f.seek(_indice_pos)
+        while True:
+            linea = f.readline()
+            if not linea.endswith("\n"):
+                # Entrada incompleta, se leerá en la próxima consulta
+                break
+            entrada = json.loads(linea)
+            _indice[entrada["id_venta"]] = (entrada["archivo"], entrada["offset"])
+            _indice_pos = f.tell()
+
+
+def leer_venta_archivada(venta_id: int) -> Optional[dict]:
+    """Busca una venta en el archivo usando el índice"""
+    with _indice_lock:
+        _actualizar_indice()
+        ubicacion = _indice.get(venta_id)
+    if ubicacion is None:
+        return None
+
+    nombre, offset = ubicacion
+    with open(os.path.join(ARCHIVO_DIR, nombre), "rb") as f:
+        f.seek(offset)
+        with gzip.GzipFile(fileobj=f, mode="rb") as gz:
+            for linea in gz:
+                venta = json.loads(linea)
+                if venta["id_venta"] == venta_id:
+                    return venta
+    return None
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        total = archivar_ventas(db)
+    finally:
+        db.close()
+    print(f"Ventas archivadas: {total}")
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import threading
+
+
+class CacheLRU:
+    """Cache en memoria de tamaño máximo fijo que descarta lo menos usado"""
+
+    def __init__(self, capacidad: int):
+        self.capacidad = capacidad
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def get(self, clave: Hashable) -> Optional[Any]:
+        with self._lock:
+            if clave not in self._datos:
+                self.fallos += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return self._datos[clave]
+
+    def set(self, clave: Hashable, valor: Any) -> None:
+        if self.capacidad <= 0:
+            return
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.capacidad:
+                self._datos.popitem(last=False)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "capacidad": self.capacidad,
+                "tamaño": len(self._datos),
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else 0.0,
+            }
@@ -0,0 +1,45 @@
+"""Calcula el costo de bcrypt adecuado para este equipo.
+
+Mide el tiempo de verificación con cada costo y recomienda el mayor que no
+supera el tiempo objetivo. El resultado se configura en `BCRYPT_ROUNDS`.
+
+Uso:
+    python -m app.calibrar_hash --objetivo-ms 250
+"""
+import argparse
+import time
+
+from passlib.hash import bcrypt
+
+
+def medir_verificacion(rondas: int, repeticiones: int = 3) -> float:
+    """Tiempo medio, en milisegundos, de verificar un hash con `rondas`"""
+    hash_prueba = bcrypt.using(rounds=rondas).hash("contraseña de prueba")
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        bcrypt.verify("contraseña de prueba", hash_prueba)
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def calibrar(objetivo_ms: float, min_rondas: int = 10, max_rondas: int = 16) -> int:
+    """Mayor costo entre `min_rondas` y `max_rondas` cuya verificación no supera el objetivo"""
+    elegido = min_rondas
+    for rondas in range(min_rondas, max_rondas + 1):
+        tiempo = medir_verificacion(rondas)
+        print(f"rondas={rondas}: {tiempo:.1f} ms")
+        if tiempo > objetivo_ms:
+            break
+        elegido = rondas
+    return elegido
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objetivo-ms", type=float, default=250,
+                        help="tiempo máximo de verificación en milisegundos")
+    parser.add_argument("--min-rondas", type=int, default=10)
+    parser.add_argument("--max-rondas", type=int, default=16)
+    args = parser.parse_args()
+
+    rondas = calibrar(args.objetivo_ms, args.min_rondas, args.max_rondas)
+    print(f"\nAgregar al archivo .env:\nBCRYPT_ROUNDS={rondas}")
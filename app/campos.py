@@ -0,0 +1,64 @@
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import load_only
+from typing import Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+
+def campos_solicitados(schema: Type[BaseModel]):
+    """Crea una dependencia que lee el parámetro `fields` y lo valida contra el esquema"""
+    def dependencia(
+        fields: Optional[str] = Query(
+            None,
+            description="Lista de campos separados por comas a incluir en la respuesta"
+        )
+    ) -> Optional[List[str]]:
+        if fields is None:
+            return None
+
+        campos = []
+        for campo in fields.split(","):
+            campo = campo.strip()
+            if campo and campo not in campos:
+                campos.append(campo)
+
+        invalidos = [c for c in campos if c not in schema.model_fields]
+        if not campos or invalidos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos no válidos: {', '.join(invalidos) or fields}"
+            )
+        return campos
+
+    return dependencia
+
+
+def limitar_columnas(query, modelo, campos: List[str]):
+    """Restringe el SELECT a las columnas del modelo incluidas en `campos`"""
+    columnas = [getattr(modelo, c)
+                for c in campos if c in modelo.__table__.columns]
+    if columnas:
+        query = query.options(load_only(*columnas))
+    return query
+
+
+def respuesta_parcial(
+    objetos,
+    campos: List[str],
+    anidados: Optional[Dict[str, Type[BaseModel]]] = None
+) -> JSONResponse:
+    """Serializa solo los campos solicitados de cada objeto"""
+    anidados = anidados or {}
+    resultado = []
+    for objeto in objetos:
+        item = {}
+        for campo in campos:
+            valor = getattr(objeto, campo)
+            if campo in anidados:
+                valor = [anidados[campo].model_validate(v).model_dump()
+                         for v in valor]
+            item[campo] = valor
+        resultado.append(item)
+    return JSONResponse(content=jsonable_encoder(resultado))
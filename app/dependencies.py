@@ -3,8 +3,11 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
+import threading
 from dotenv import load_dotenv
 
 from . import schemas, models
@@ -20,8 +23,20 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
     os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Procesos usados para generar hashes en lote (por defecto, uno por CPU)
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", "0")) or None
+
 # === Seguridad ===
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Costo de bcrypt; calcularlo para este equipo con `python -m app.calibrar_hash`.
+# Los hashes con otro costo se regeneran al iniciar sesión (ver authenticate_user)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 oauth2_scheme = HTTPBearer()  # Cambiado para usar Bearer token puro
 
 
@@ -35,14 +50,52 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """Crea el pool de procesos la primera vez que se necesita"""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # "spawn" evita hacer fork del proceso del servidor, que tiene hilos
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"))
+        return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Detiene el pool de procesos de hashing, si se llegó a crear"""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown()
+            _hash_pool = None
+
+
+def get_password_hashes(passwords: List[str]) -> List[str]:
+    """Genera los hashes de varias contraseñas en paralelo, conservando el orden"""
+    if len(passwords) < 2:
+        return [get_password_hash(p) for p in passwords]
+    return list(_get_hash_pool().map(get_password_hash, passwords))
+
+
 def authenticate_user(db: Session, username: str, password: str) -> Optional[models.Usuario]:
     """Autentica un usuario con nombre de usuario y contraseña"""
     user = db.query(models.Usuario).filter(
         models.Usuario.nombre_usuario == username).first()
     if not user:
         return None
-    if not verify_password(password, user.contraseña):
+    valido, nuevo_hash = pwd_context.verify_and_update(
+        password, user.contraseña)
+    if not valido:
         return None
+    if nuevo_hash:
+        # El hash no cumple la configuración actual: se guarda uno nuevo
+        user.contraseña = nuevo_hash
+        db.commit()
     return user
 
 
@@ -0,0 +1,132 @@
+"""Distribución en proceso de los cambios de productos (stock, precio, bajas).
+
+Cada suscriptor tiene un buffer acotado con un solo evento pendiente por
+producto: si un producto cambia varias veces antes de que el cliente lea, solo
+recibe el último estado. Los suscriptores inactivos no consumen CPU, solo
+esperan un `asyncio.Event`.
+"""
+from collections import OrderedDict, deque
+from typing import List, Optional, Tuple
+import asyncio
+import json
+import os
+import threading
+import time
+
+EVENTOS_HISTORIAL = int(os.getenv("EVENTOS_HISTORIAL", "1000"))
+EVENTOS_BUFFER = int(os.getenv("EVENTOS_BUFFER", "256"))
+
+# Mensajes SSE sin datos de producto
+SSE_RESET = "event: reset\ndata: {}\n\n"
+SSE_PING = ": ping\n\n"
+
+
+def formato_sse(evento: dict) -> str:
+    """Convierte un evento de producto en un mensaje Server-Sent Events"""
+    datos = {"id_producto": evento["id_producto"],
+             "tipo": evento["tipo"], **evento["datos"]}
+    return f"id: {evento['id']}\nevent: producto\ndata: {json.dumps(datos)}\n\n"
+
+
+class Suscriptor:
+    def __init__(self, capacidad: int, loop: asyncio.AbstractEventLoop):
+        self.capacidad = capacidad
+        self.pendientes = OrderedDict()
+        self.reiniciar = False
+        self._loop = loop
+        self._aviso = asyncio.Event()
+
+    def _agregar(self, evento: dict) -> None:
+        # Combina con el evento pendiente del mismo producto y lo pasa al final
+        anterior = self.pendientes.pop(evento["id_producto"], None)
+        if anterior is not None and "eliminado" not in (anterior["tipo"], evento["tipo"]):
+            tipo = evento["tipo"]
+            if anterior["tipo"] == "actualizado":
+                # El evento anterior tenía el producto completo
+                tipo = "actualizado"
+            evento = {**evento, "tipo": tipo,
+                      "datos": {**anterior["datos"], **evento["datos"]}}
+        self.pendientes[evento["id_producto"]] = evento
+        if len(self.pendientes) > self.capacidad:
+            # Cliente demasiado lento: debe volver a sincronizar el catálogo
+            self.pendientes.clear()
+            self.reiniciar = True
+
+    def _avisar(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._aviso.set)
+        except RuntimeError:
+            # El loop del suscriptor ya se cerró
+            pass
+
+
+class CentroEventos:
+    def __init__(self, historial: int = EVENTOS_HISTORIAL, capacidad: int = EVENTOS_BUFFER):
+        # Los IDs de evento llevan la época del proceso para detectar reinicios
+        self.epoca = str(int(time.time()))
+        self.capacidad = capacidad
+        self._lock = threading.Lock()
+        self._ultimo_id = 0
+        self._historial = deque(maxlen=historial)
+        self._suscriptores = set()
+
+    def publicar(self, id_producto: int, tipo: str, datos: Optional[dict] = None) -> None:
+        """Envía un cambio de producto a todos los suscriptores; seguro entre hilos"""
+        with self._lock:
+            self._ultimo_id += 1
+            evento = {"id": f"{self.epoca}-{self._ultimo_id}",
+                      "numero": self._ultimo_id,
+                      "id_producto": id_producto,
+                      "tipo": tipo,
+                      "datos": datos or {}}
+            self._historial.append(evento)
+            suscriptores = list(self._suscriptores)
+            for suscriptor in suscriptores:
+                suscriptor._agregar(evento)
+        for suscriptor in suscriptores:
+            suscriptor._avisar()
+
+    def suscribir(self, ultimo_id: Optional[str] = None) -> Suscriptor:
+        """Registra un suscriptor y le reenvía lo ocurrido después de `ultimo_id`"""
+        suscriptor = Suscriptor(self.capacidad, asyncio.get_running_loop())
+        with self._lock:
+            if ultimo_id is not None:
+                numero = self._numero_desde(ultimo_id)
+                primero = self._historial[0]["numero"] if self._historial else self._ultimo_id + 1
+                if numero is None or numero < primero - 1:
+                    # Los eventos intermedios ya no están en el historial
+                    suscriptor.reiniciar = True
+                else:
+                    for evento in self._historial:
+                        if evento["numero"] > numero:
+                            suscriptor._agregar(evento)
+            self._suscriptores.add(suscriptor)
+        if suscriptor.pendientes or suscriptor.reiniciar:
+            suscriptor._aviso.set()
+        return suscriptor
+
+    def desuscribir(self, suscriptor: Suscriptor) -> None:
+        with self._lock:
+            self._suscriptores.discard(suscriptor)
+
+    async def esperar(self, suscriptor: Suscriptor, timeout: float) -> Tuple[bool, List[dict]]:
+        """Espera eventos; devuelve (reiniciar, eventos) o (False, []) al vencer el timeout"""
+        try:
+            await asyncio.wait_for(suscriptor._aviso.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False, []
+        with self._lock:
+            suscriptor._aviso.clear()
+            reiniciar, suscriptor.reiniciar = suscriptor.reiniciar, False
+            eventos = list(suscriptor.pendientes.values())
+            suscriptor.pendientes.clear()
+        return reiniciar, eventos
+
+    def _numero_desde(self, ultimo_id: str) -> Optional[int]:
+        epoca, _, numero = ultimo_id.partition("-")
+        if epoca != self.epoca or not numero.isdigit() or int(numero) > self._ultimo_id:
+            return None
+        return int(numero)
+
+
+centro_eventos = CentroEventos()
@@ -1,7 +1,11 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.routes import auth, productos, usuarios, ventas
+from app.dependencies import shutdown_hash_pool
 from app.database import engine, Base
+import os
 
 
 #    !!!!!!!! ATENCION NO TOCAR, FUNCIONA Y NO SE PORQUE !!!!!!!!!!
@@ -24,7 +28,16 @@ from app.database import engine, Base
 # Crear las tablas en la base de datos
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Detener los procesos usados por /registro-lote
+    shutdown_hash_pool()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     title="API Supermercado",
     description="API para gestión de supermercado con autenticación por roles",
     version="1.0.0",
@@ -41,6 +54,12 @@ app.add_middleware(
     allow_headers=["*"],  # Permite todos los headers
 )
 
+# Comprimir respuestas grandes (tamaño mínimo en bytes)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+)
+
 # Incluir los routers
 app.include_router(auth.router)
 app.include_router(productos.router)
@@ -62,10 +81,12 @@ def info_permisos():
         ],
         "endpoints_solo_administrador": [
             "POST /registro-admin - Crear administradores",
+            "POST /registro-lote - Crear usuarios en lote",
             "POST /productos - Crear productos",
             "PUT /productos/{id} - Actualizar productos",
             "DELETE /productos/{id} - Eliminar productos",
             "GET /ventas - Ver todas las ventas",
+            "GET /ventas/cache/estadisticas - Ver métricas de la cache de ventas",
             "GET /usuarios - Ver todos los usuarios",
             "GET /usuarios/{id} - Ver usuario específico",
             "PUT /usuarios/{id} - Actualizar usuario",
@@ -74,6 +95,9 @@ def info_permisos():
         "endpoints_administrador_y_comprador": [
             "GET /productos - Ver productos",
             "GET /productos/{id} - Ver producto específico",
+            "GET /productos/batch?ids=1&ids=2 - Ver varios productos",
+            "GET /productos/cambios?desde=<token> - Ver cambios del catálogo",
+            "GET /productos/eventos - Recibir cambios de productos en vivo (SSE)",
             "POST /ventas - Crear ventas",
             "GET /ventas/{id} - Ver venta específica",
             "GET /ventas/mis-ventas - Ver mis propias ventas",
@@ -1,5 +1,6 @@
 from sqlalchemy import (
-    Column, Integer, String, Float, ForeignKey, DateTime, Enum, CheckConstraint, Text
+    Column, Integer, String, Float, ForeignKey, DateTime, Enum, CheckConstraint, Text,
+    Index
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -38,19 +39,36 @@ class Producto(Base):
     stock = Column(Integer, nullable=False, default=0)
     categoria = Column(String(50))
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_actualizacion = Column(DateTime(timezone=True), server_default=func.now(),
+                                 onupdate=func.now(), index=True)
 
     detalles_venta = relationship("DetalleVenta", back_populates="producto")
 
 
+class ProductoEliminado(Base):
+    """Registro de productos eliminados para la sincronización incremental"""
+    __tablename__ = "productos_eliminados"
+
+    id_producto = Column(Integer, primary_key=True)
+    fecha_eliminacion = Column(DateTime(timezone=True), server_default=func.now(),
+                               nullable=False, index=True)
+
+
 class Venta(Base):
     __tablename__ = "ventas"
 
     id_venta = Column(Integer, primary_key=True, index=True)
     id_usuario = Column(Integer, ForeignKey(
         "usuarios.id_usuario", ondelete="RESTRICT"), nullable=False)
-    fecha_venta = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_venta = Column(DateTime(timezone=True),
+                         server_default=func.now(), index=True)
     total = Column(Float, nullable=False)
 
+    # Cubre también las búsquedas solo por id_usuario (prefijo del índice)
+    __table_args__ = (
+        Index("ix_ventas_id_usuario_fecha_venta", "id_usuario", "fecha_venta"),
+    )
+
     usuario = relationship("Usuario", back_populates="ventas")
     detalles = relationship(
         "DetalleVenta", back_populates="venta", cascade="all, delete")
@@ -61,9 +79,9 @@ class DetalleVenta(Base):
 
     id_detalle = Column(Integer, primary_key=True, index=True)
     id_venta = Column(Integer, ForeignKey(
-        "ventas.id_venta", ondelete="CASCADE"), nullable=False)
+        "ventas.id_venta", ondelete="CASCADE"), nullable=False, index=True)
     id_producto = Column(Integer, ForeignKey(
-        "productos.id_producto", ondelete="RESTRICT"), nullable=False)
+        "productos.id_producto", ondelete="RESTRICT"), nullable=False, index=True)
     cantidad = Column(Integer, nullable=False)
     precio_unitario = Column(Float, nullable=False)
 
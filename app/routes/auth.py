@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from datetime import timedelta
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import schemas, models, dependencies
@@ -7,6 +9,42 @@ from ..database import get_db
 
 router = APIRouter(tags=["auth"])
 
+# Máximo de usuarios aceptados por solicitud en /registro-lote
+MAX_USUARIOS_LOTE = 1000
+
+# Restricciones únicas de la tabla usuarios y el error que corresponde a cada una
+ERRORES_UNICIDAD = {
+    "ix_usuarios_nombre_usuario": "Nombre de usuario ya registrado",
+    "usuarios_correo_key": "Correo electrónico ya registrado",
+}
+
+
+def _guardar_usuario(db: Session, usuario, rol: models.RolUsuario) -> models.Usuario:
+    """Crea el usuario confiando en las restricciones únicas de la tabla"""
+    db_usuario = models.Usuario(
+        nombre_usuario=usuario.nombre_usuario,
+        contraseña=dependencies.get_password_hash(usuario.contraseña),
+        rol=rol,
+        nombre_completo=usuario.nombre_completo,
+        telefono=usuario.telefono,
+        correo=usuario.correo
+    )
+
+    db.add(db_usuario)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        diag = getattr(e.orig, "diag", None)
+        # Sin nombre de restricción (p. ej. otros motores) se usa un mensaje genérico
+        detail = ERRORES_UNICIDAD.get(
+            getattr(diag, "constraint_name", None),
+            "Nombre de usuario o correo electrónico ya registrado")
+        raise HTTPException(status_code=400, detail=detail)
+
+    db.refresh(db_usuario)
+    return db_usuario
+
 
 @router.post("/login", response_model=schemas.Token)
 async def login_for_access_token(
@@ -35,39 +73,8 @@ def registrar_comprador(
     usuario: schemas.UsuarioCompradorCreate,
     db: Session = Depends(get_db)
 ):
-    # Verificar si el usuario ya existe
-    db_user = db.query(models.Usuario).filter(
-        models.Usuario.nombre_usuario == usuario.nombre_usuario).first()
-    if db_user:
-        raise HTTPException(
-            status_code=400,
-            detail="Nombre de usuario ya registrado"
-        )
-
-    # Verificar si el correo ya está registrado
-    db_email = db.query(models.Usuario).filter(
-        models.Usuario.correo == usuario.correo).first()
-    if db_email:
-        raise HTTPException(
-            status_code=400,
-            detail="Correo electrónico ya registrado"
-        )
-
     # Crear usuario con rol de comprador
-    hashed_password = dependencies.get_password_hash(usuario.contraseña)
-    db_usuario = models.Usuario(
-        nombre_usuario=usuario.nombre_usuario,
-        contraseña=hashed_password,
-        rol=models.RolUsuario.comprador,  # Usar el enum
-        nombre_completo=usuario.nombre_completo,
-        telefono=usuario.telefono,
-        correo=usuario.correo
-    )
-
-    db.add(db_usuario)
-    db.commit()
-    db.refresh(db_usuario)
-    return db_usuario
+    return _guardar_usuario(db, usuario, models.RolUsuario.comprador)
 
 
 @router.post("/registro-admin", response_model=schemas.UsuarioResponse)
@@ -76,36 +83,82 @@ def registrar_administrador(
     db: Session = Depends(get_db),
     current_user: models.Usuario = Depends(dependencies.es_administrador)
 ):
-    # Verificar si el usuario ya existe
-    db_user = db.query(models.Usuario).filter(
-        models.Usuario.nombre_usuario == usuario.nombre_usuario).first()
-    if db_user:
+    # Crear usuario administrador
+    return _guardar_usuario(db, usuario, models.RolUsuario.administrador)
+
+
+@router.post("/registro-lote", response_model=schemas.UsuariosLoteResponse)
+def registrar_lote(
+    lote: schemas.UsuariosLoteCreate,
+    db: Session = Depends(get_db),
+    current_user: models.Usuario = Depends(dependencies.es_administrador)
+):
+    """Solo administradores pueden crear usuarios en lote"""
+    if len(lote.usuarios) > MAX_USUARIOS_LOTE:
         raise HTTPException(
             status_code=400,
-            detail="Nombre de usuario ya registrado"
+            detail=f"El lote no puede superar {MAX_USUARIOS_LOTE} usuarios"
         )
 
-    # Verificar si el correo ya está registrado
-    db_email = db.query(models.Usuario).filter(
-        models.Usuario.correo == usuario.correo).first()
-    if db_email:
+    # Una sola consulta para los nombres y correos ya registrados
+    nombres = {u.nombre_usuario for u in lote.usuarios}
+    correos = {u.correo for u in lote.usuarios}
+    existentes = db.query(models.Usuario.nombre_usuario, models.Usuario.correo).filter(
+        or_(models.Usuario.nombre_usuario.in_(nombres),
+            models.Usuario.correo.in_(correos))).all()
+    nombres_usados = {e.nombre_usuario for e in existentes}
+    correos_usados = {e.correo for e in existentes}
+
+    conflictos = []
+    aceptados = []
+    for indice, usuario in enumerate(lote.usuarios):
+        motivos = []
+        if usuario.nombre_usuario in nombres_usados:
+            motivos.append("Nombre de usuario ya registrado")
+        if usuario.correo in correos_usados:
+            motivos.append("Correo electrónico ya registrado")
+        if motivos:
+            conflictos.append(schemas.ConflictoLote(
+                indice=indice,
+                nombre_usuario=usuario.nombre_usuario,
+                correo=usuario.correo,
+                detalle="; ".join(motivos)
+            ))
+            continue
+        # Los siguientes del mismo lote con igual nombre o correo son conflictos
+        nombres_usados.add(usuario.nombre_usuario)
+        correos_usados.add(usuario.correo)
+        aceptados.append(usuario)
+
+    if not aceptados:
+        return {"creados": [], "conflictos": conflictos}
+
+    hashes = dependencies.get_password_hashes(
+        [u.contraseña for u in aceptados])
+    filas = [
+        {
+            "nombre_usuario": u.nombre_usuario,
+            "contraseña": hashed_password,
+            "rol": models.RolUsuario(u.rol.value),
+            "nombre_completo": u.nombre_completo,
+            "telefono": u.telefono,
+            "correo": u.correo,
+        }
+        for u, hashed_password in zip(aceptados, hashes)
+    ]
+
+    try:
+        db_usuarios = db.scalars(
+            insert(models.Usuario).returning(
+                models.Usuario, sort_by_parameter_order=True), filas).all()
+        creados = [schemas.UsuarioResponse.model_validate(u)
+                   for u in db_usuarios]
+        db.commit()
+    except IntegrityError:
+        db.rollback()
         raise HTTPException(
-            status_code=400,
-            detail="Correo electrónico ya registrado"
+            status_code=409,
+            detail="Otro registro concurrente usó alguno de los usuarios del lote, intente de nuevo"
         )
 
-    # Crear usuario administrador
-    hashed_password = dependencies.get_password_hash(usuario.contraseña)
-    db_usuario = models.Usuario(
-        nombre_usuario=usuario.nombre_usuario,
-        contraseña=hashed_password,
-        rol=models.RolUsuario.administrador,  # Usar el enum
-        nombre_completo=usuario.nombre_completo,
-        telefono=usuario.telefono,
-        correo=usuario.correo
-    )
-
-    db.add(db_usuario)
-    db.commit()
-    db.refresh(db_usuario)
-    return db_usuario
+    return {"creados": creados, "conflictos": conflictos}
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+import os
 
 from app import schemas, models, dependencies
+from app.campos import campos_solicitados, limitar_columnas, respuesta_parcial
+from app.eventos import SSE_PING, SSE_RESET, centro_eventos, formato_sse
 from ..database import get_db
 
 router = APIRouter(
@@ -10,16 +16,55 @@ router = APIRouter(
     tags=["productos"]
 )
 
+# Máximo de IDs aceptados por /productos/batch
+MAX_PRODUCTOS_LOTE = 200
+
+# El token de /productos/cambios retrocede este margen para no perder cambios
+# de transacciones que empezaron antes de la consulta y confirmaron después
+SYNC_MARGEN_SEGUNDOS = int(os.getenv("SYNC_MARGEN_SEGUNDOS", "30"))
+_EPOCA = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _en_utc(fecha: datetime) -> datetime:
+    # Algunos motores (p. ej. SQLite) devuelven fechas sin zona horaria, en UTC
+    if fecha.tzinfo is None:
+        return fecha.replace(tzinfo=timezone.utc)
+    return fecha
+
+
+def _fecha_a_token(fecha: datetime) -> str:
+    return str((_en_utc(fecha) - _EPOCA) // timedelta(microseconds=1))
+
+
+def _publicar_producto(db_producto: models.Producto) -> None:
+    datos = schemas.Producto.model_validate(db_producto).model_dump(mode="json")
+    centro_eventos.publicar(db_producto.id_producto, "actualizado", datos)
+
+
+def _token_a_fecha(token: str) -> datetime:
+    try:
+        return _EPOCA + timedelta(microseconds=int(token))
+    except (ValueError, OverflowError):
+        raise HTTPException(
+            status_code=400, detail="Token de sincronización no válido")
+
 
 @router.get("/", response_model=List[schemas.Producto])
 def leer_productos(
     skip: int = 0,
     limit: int = 100,
+    campos: Optional[List[str]] = Depends(
+        campos_solicitados(schemas.Producto)),
     db: Session = Depends(get_db),
     current_user: models.Usuario = Depends(
         dependencies.es_administrador_o_comprador)
 ):
-    productos = db.query(models.Producto).offset(skip).limit(limit).all()
+    query = db.query(models.Producto)
+    if campos is not None:
+        query = limitar_columnas(query, models.Producto, campos)
+    productos = query.offset(skip).limit(limit).all()
+    if campos is not None:
+        return respuesta_parcial(productos, campos)
     return productos
 
 
@@ -34,9 +79,102 @@ def crear_producto(
     db.add(db_producto)
     db.commit()
     db.refresh(db_producto)
+    _publicar_producto(db_producto)
     return db_producto
 
 
+@router.get("/batch", response_model=List[schemas.ProductoLote])
+def leer_productos_lote(
+    ids: List[int] = Query(...),
+    db: Session = Depends(get_db),
+    current_user: models.Usuario = Depends(
+        dependencies.es_administrador_o_comprador)
+):
+    """Resuelve varios productos en una sola consulta, en el orden pedido"""
+    if len(ids) > MAX_PRODUCTOS_LOTE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No se pueden pedir más de {MAX_PRODUCTOS_LOTE} productos"
+        )
+
+    productos = {
+        p.id_producto: p
+        for p in db.query(models.Producto).filter(
+            models.Producto.id_producto.in_(set(ids))).all()
+    }
+    return [
+        {
+            "id_producto": producto_id,
+            "encontrado": producto_id in productos,
+            "producto": productos.get(producto_id),
+        }
+        for producto_id in ids
+    ]
+
+
+@router.get("/cambios", response_model=schemas.CambiosProductos)
+def leer_cambios_productos(
+    desde: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.Usuario = Depends(
+        dependencies.es_administrador_o_comprador)
+):
+    """Devuelve los productos modificados y eliminados desde el token indicado;
+    sin token devuelve el catálogo completo"""
+    ahora = _en_utc(db.query(func.now()).scalar())
+    token = ahora - timedelta(seconds=SYNC_MARGEN_SEGUNDOS)
+
+    query = db.query(models.Producto)
+    eliminados = []
+    if desde is not None:
+        fecha = _token_a_fecha(desde)
+        token = max(token, fecha)
+        query = query.filter(models.Producto.fecha_actualizacion > fecha)
+        eliminados = [
+            e.id_producto
+            for e in db.query(models.ProductoEliminado.id_producto).filter(
+                models.ProductoEliminado.fecha_eliminacion > fecha).all()
+        ]
+
+    return {
+        "token": _fecha_a_token(token),
+        "actualizados": query.order_by(models.Producto.fecha_actualizacion).all(),
+        "eliminados": eliminados,
+    }
+
+
+@router.get("/eventos")
+async def suscribir_eventos_productos(
+    request: Request,
+    current_user: models.Usuario = Depends(
+        dependencies.es_administrador_o_comprador)
+):
+    """Transmite (Server-Sent Events) los cambios de stock, precio y bajas de productos.
+    Un evento `reset` indica que el cliente debe volver a sincronizar con /productos/cambios"""
+    suscriptor = centro_eventos.suscribir(request.headers.get("last-event-id"))
+
+    async def transmitir():
+        try:
+            while not await request.is_disconnected():
+                reiniciar, eventos = await centro_eventos.esperar(
+                    suscriptor, timeout=15)
+                if reiniciar:
+                    yield SSE_RESET
+                elif not eventos:
+                    # Mantiene viva la conexión a través de proxies
+                    yield SSE_PING
+                for evento in eventos:
+                    yield formato_sse(evento)
+        finally:
+            centro_eventos.desuscribir(suscriptor)
+
+    return StreamingResponse(
+        transmitir(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{producto_id}", response_model=schemas.Producto)
 def leer_producto(
     producto_id: int,
@@ -69,6 +207,7 @@ def actualizar_producto(
 
     db.commit()
     db.refresh(db_producto)
+    _publicar_producto(db_producto)
     return db_producto
 
 
@@ -85,5 +224,7 @@ def eliminar_producto(
         raise HTTPException(status_code=404, detail="Producto no encontrado")
 
     db.delete(db_producto)
+    db.add(models.ProductoEliminado(id_producto=producto_id))
     db.commit()
+    centro_eventos.publicar(producto_id, "eliminado")
     return {"mensaje": "Producto eliminado correctamente"}
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import schemas, models, dependencies
+from app.campos import campos_solicitados, limitar_columnas, respuesta_parcial
 from ..database import get_db
 
 router = APIRouter(
@@ -15,11 +16,18 @@ router = APIRouter(
 def leer_usuarios(
     skip: int = 0,
     limit: int = 100,
+    campos: Optional[List[str]] = Depends(
+        campos_solicitados(schemas.UsuarioResponse)),
     db: Session = Depends(get_db),
     current_user: models.Usuario = Depends(dependencies.es_administrador)
 ):
     """Solo administradores pueden ver la lista de usuarios"""
-    usuarios = db.query(models.Usuario).offset(skip).limit(limit).all()
+    query = db.query(models.Usuario)
+    if campos is not None:
+        query = limitar_columnas(query, models.Usuario, campos)
+    usuarios = query.offset(skip).limit(limit).all()
+    if campos is not None:
+        return respuesta_parcial(usuarios, campos)
     return usuarios
 
 
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
 from datetime import datetime
+import hashlib
+import os
 
-from app import schemas, models, dependencies
+from app import schemas, models, dependencies, archivo
+from app.cache import CacheLRU
+from app.campos import campos_solicitados, limitar_columnas, respuesta_parcial
+from app.eventos import centro_eventos
 from ..database import get_db
 
 router = APIRouter(
@@ -11,6 +16,35 @@ router = APIRouter(
     tags=["ventas"]
 )
 
+# Las ventas no cambian después de crearse: se guarda su JSON ya serializado
+cache_ventas = CacheLRU(int(os.getenv("VENTAS_CACHE_MAX", "1000")))
+
+
+def _filtrar_fechas(query, desde: Optional[datetime], hasta: Optional[datetime]):
+    """Filtra las ventas por rango de fechas (ambos extremos inclusivos)"""
+    if desde is not None:
+        query = query.filter(models.Venta.fecha_venta >= desde)
+    if hasta is not None:
+        query = query.filter(models.Venta.fecha_venta <= hasta)
+    return query
+
+
+def _listar_ventas(query, campos: Optional[List[str]], detalles: bool, skip: int, limit: int):
+    """Aplica la selección de campos y la carga de detalles a una consulta de ventas"""
+    if campos is None and detalles:
+        return query.options(selectinload(models.Venta.detalles)).offset(skip).limit(limit).all()
+
+    if campos is None:
+        campos = list(schemas.Venta.model_fields)
+    if not detalles:
+        campos = [c for c in campos if c != "detalles"]
+
+    query = limitar_columnas(query, models.Venta, campos)
+    if "detalles" in campos:
+        query = query.options(selectinload(models.Venta.detalles))
+    ventas = query.offset(skip).limit(limit).all()
+    return respuesta_parcial(ventas, campos, {"detalles": schemas.DetalleVenta})
+
 
 @router.post("/", response_model=schemas.Venta)
 def crear_venta(
@@ -50,13 +84,17 @@ def crear_venta(
     )
 
     # Descontar stock
+    stock_final = {}
     for detalle in venta.detalles:
         producto = db.query(models.Producto).filter(
             models.Producto.id_producto == detalle.id_producto).first()
         producto.stock -= detalle.cantidad
+        stock_final[producto.id_producto] = producto.stock
 
     db.add(db_venta)
     db.commit()
+    for id_producto, stock in stock_final.items():
+        centro_eventos.publicar(id_producto, "stock", {"stock": stock})
     db.refresh(db_venta)
     return db_venta
 
@@ -65,45 +103,90 @@ def crear_venta(
 def leer_ventas(
     skip: int = 0,
     limit: int = 100,
+    detalles: bool = True,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    campos: Optional[List[str]] = Depends(campos_solicitados(schemas.Venta)),
     db: Session = Depends(get_db),
     current_user: models.Usuario = Depends(dependencies.es_administrador)
 ):
     """Solo administradores pueden ver todas las ventas"""
-    ventas = db.query(models.Venta).offset(skip).limit(limit).all()
-    return ventas
+    query = _filtrar_fechas(db.query(models.Venta), desde, hasta)
+    return _listar_ventas(query, campos, detalles, skip, limit)
 
 
 @router.get("/mis-ventas", response_model=List[schemas.Venta])
 def leer_mis_ventas(
     skip: int = 0,
     limit: int = 100,
+    detalles: bool = True,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    campos: Optional[List[str]] = Depends(campos_solicitados(schemas.Venta)),
     db: Session = Depends(get_db),
     current_user: models.Usuario = Depends(
         dependencies.es_administrador_o_comprador)
 ):
     """Los compradores pueden ver solo sus propias ventas, administradores ven todas"""
-    if current_user.rol == models.RolUsuario.administrador:
-        ventas = db.query(models.Venta).offset(skip).limit(limit).all()
-    else:
-        ventas = db.query(models.Venta).filter(
-            models.Venta.id_usuario == current_user.id_usuario).offset(skip).limit(limit).all()
-    return ventas
+    query = db.query(models.Venta)
+    if current_user.rol != models.RolUsuario.administrador:
+        query = query.filter(
+            models.Venta.id_usuario == current_user.id_usuario)
+    query = _filtrar_fechas(query, desde, hasta)
+    return _listar_ventas(query, campos, detalles, skip, limit)
+
+
+@router.get("/cache/estadisticas")
+def leer_estadisticas_cache(
+    current_user: models.Usuario = Depends(dependencies.es_administrador)
+):
+    """Solo administradores pueden ver las métricas de la cache de ventas"""
+    return cache_ventas.estadisticas()
+
+
+def _etag_coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de ETags, como pide If-None-Match"""
+    if not if_none_match:
+        return False
+    etiquetas = [e.strip().removeprefix("W/") for e in if_none_match.split(",")]
+    return "*" in etiquetas or etag.removeprefix("W/") in etiquetas
 
 
 @router.get("/{venta_id}", response_model=schemas.Venta)
 def leer_venta(
     venta_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.Usuario = Depends(
         dependencies.es_administrador_o_comprador)
 ):
-    venta = db.query(models.Venta).filter(
-        models.Venta.id_venta == venta_id).first()
-    if not venta:
-        raise HTTPException(status_code=404, detail="Venta no encontrada")
-
-    if current_user.rol != models.RolUsuario.administrador and venta.id_usuario != current_user.id_usuario:
+    entrada = cache_ventas.get(venta_id)
+    if entrada is None:
+        venta = db.query(models.Venta).filter(
+            models.Venta.id_venta == venta_id).first()
+        if not venta:
+            # Las ventas antiguas pueden estar en el archivo
+            venta = archivo.leer_venta_archivada(venta_id)
+            if not venta:
+                raise HTTPException(
+                    status_code=404, detail="Venta no encontrada")
+
+        venta = schemas.Venta.model_validate(venta)
+        cuerpo = venta.model_dump_json().encode("utf-8")
+        # ETag débil: GZipMiddleware puede enviar el mismo contenido comprimido
+        etag = 'W/"' + hashlib.sha256(cuerpo).hexdigest()[:32] + '"'
+        entrada = (venta.id_usuario, cuerpo, etag)
+        cache_ventas.set(venta_id, entrada)
+
+    id_usuario, cuerpo, etag = entrada
+    if current_user.rol != models.RolUsuario.administrador and id_usuario != current_user.id_usuario:
         raise HTTPException(
             status_code=403, detail="No tienes permiso para ver esta venta")
 
-    return venta
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if _etag_coincide(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cuerpo, media_type="application/json", headers=headers)
@@ -52,10 +52,31 @@ class UsuarioResponse(UsuarioBase):
     fecha_registro: datetime
 
     class Config:
-        orm_mode = True
+        from_attributes = True
         use_enum_values = True
 
 
+class UsuarioLoteCreate(UsuarioBase):
+    contraseña: str
+    rol: RolUsuarioEnum = RolUsuarioEnum.comprador
+
+
+class UsuariosLoteCreate(BaseModel):
+    usuarios: List[UsuarioLoteCreate]
+
+
+class ConflictoLote(BaseModel):
+    indice: int
+    nombre_usuario: str
+    correo: str
+    detalle: str
+
+
+class UsuariosLoteResponse(BaseModel):
+    creados: List[UsuarioResponse]
+    conflictos: List[ConflictoLote]
+
+
 # === Productos ===
 
 class ProductoBase(BaseModel):
@@ -73,9 +94,22 @@ class ProductoCreate(ProductoBase):
 class Producto(ProductoBase):
     id_producto: int
     fecha_creacion: datetime
+    fecha_actualizacion: Optional[datetime] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class ProductoLote(BaseModel):
+    id_producto: int
+    encontrado: bool
+    producto: Optional[Producto] = None
+
+
+class CambiosProductos(BaseModel):
+    token: str
+    actualizados: List[Producto]
+    eliminados: List[int]
 
 
 # === Detalle de ventas ===
@@ -95,7 +129,7 @@ class DetalleVenta(DetalleVentaBase):
     subtotal: float
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 
 # === Ventas ===
@@ -116,4 +150,4 @@ class Venta(VentaBase):
     detalles: List[DetalleVenta]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
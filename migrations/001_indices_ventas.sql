@@ -0,0 +1,21 @@
+-- Índices para las claves foráneas de ventas y detalle_ventas y para las
+-- consultas por rango de fechas. Base.metadata.create_all no agrega índices
+-- a tablas existentes, por eso se aplican con este script.
+--
+-- CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción:
+--   psql "$DATABASE_URL" -f migrations/001_indices_ventas.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ventas_id_usuario_fecha_venta
+    ON ventas (id_usuario, fecha_venta);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ventas_fecha_venta
+    ON ventas (fecha_venta);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_detalle_ventas_id_venta
+    ON detalle_ventas (id_venta);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_detalle_ventas_id_producto
+    ON detalle_ventas (id_producto);
+
+ANALYZE ventas;
+ANALYZE detalle_ventas;
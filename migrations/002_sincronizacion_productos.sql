@@ -0,0 +1,17 @@
+-- Columnas y tabla usadas por GET /productos/cambios. Los productos
+-- existentes quedan con la fecha en que se aplica la migración.
+--   psql "$DATABASE_URL" -f migrations/002_sincronizacion_productos.sql
+
+ALTER TABLE productos
+    ADD COLUMN IF NOT EXISTS fecha_actualizacion TIMESTAMP WITH TIME ZONE DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS ix_productos_fecha_actualizacion
+    ON productos (fecha_actualizacion);
+
+CREATE TABLE IF NOT EXISTS productos_eliminados (
+    id_producto INTEGER PRIMARY KEY,
+    fecha_eliminacion TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_productos_eliminados_fecha_eliminacion
+    ON productos_eliminados (fecha_eliminacion);
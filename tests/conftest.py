@@ -0,0 +1,95 @@
+import os
+import tempfile
+
+from dotenv import load_dotenv
+
+# La URL original (por ejemplo de PostgreSQL) se reserva para las pruebas que
+# la necesitan; el resto usa una base SQLite temporal
+load_dotenv()
+URL_ORIGINAL = os.getenv("DATABASE_URL", "")
+
+_directorio = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directorio, 'pruebas.db')}"
+os.environ.setdefault("SECRET_KEY", "clave-de-pruebas")
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import dependencies, models
+from app.database import Base, get_db
+from app.main import app
+from app.routes.ventas import cache_ventas
+
+
+@pytest.fixture
+def postgres_url():
+    if not URL_ORIGINAL.startswith("postgresql"):
+        pytest.skip("Requiere DATABASE_URL de PostgreSQL")
+    return URL_ORIGINAL
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        os.environ["DATABASE_URL"], connect_args={"check_same_thread": False})
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine):
+    SesionPruebas = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db_pruebas():
+        session = SesionPruebas()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = get_db_pruebas
+    cache_ventas.limpiar()
+    with TestClient(app) as cliente:
+        yield cliente
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def crear_usuario(db):
+    """Crea un usuario y devuelve las cabeceras de autenticación para usarlo"""
+    def crear(nombre_usuario, rol=models.RolUsuario.comprador):
+        db.add(models.Usuario(
+            nombre_usuario=nombre_usuario,
+            contraseña=dependencies.get_password_hash("secreta"),
+            rol=rol,
+            nombre_completo=nombre_usuario.title(),
+            correo=f"{nombre_usuario}@example.com"
+        ))
+        db.commit()
+        token = dependencies.create_access_token({"sub": nombre_usuario})
+        return {"Authorization": f"Bearer {token}"}
+
+    return crear
+
+
+@pytest.fixture
+def producto(db):
+    db_producto = models.Producto(
+        nombre="Leche", descripcion="Entera 1L", precio=7.5, stock=50, categoria="Lácteos")
+    db.add(db_producto)
+    db.commit()
+    db.refresh(db_producto)
+    return db_producto
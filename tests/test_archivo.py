@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import pytest
+
+from app import archivo, models
+
+
+@pytest.fixture
+def directorio_archivo(tmp_path, monkeypatch):
+    monkeypatch.setattr(archivo, "ARCHIVO_DIR", str(tmp_path))
+    monkeypatch.setattr(archivo, "_indice", {})
+    monkeypatch.setattr(archivo, "_indice_pos", 0)
+    return tmp_path
+
+
+def test_archivar_y_leer_venta(client, db, crear_usuario, producto, directorio_archivo):
+    comprador = crear_usuario("cajero")
+    venta = client.post("/ventas/", headers=comprador, json={"detalles": [
+        {"id_producto": producto.id_producto, "cantidad": 3, "precio_unitario": 7.5}
+    ]}).json()
+    reciente = client.post("/ventas/", headers=comprador, json={"detalles": [
+        {"id_producto": producto.id_producto, "cantidad": 1, "precio_unitario": 7.5}
+    ]}).json()
+
+    db_venta = db.get(models.Venta, venta["id_venta"])
+    db_venta.fecha_venta = datetime(2020, 5, 10, 12, 0)
+    db.commit()
+    venta["fecha_venta"] = "2020-05-10T12:00:00"
+
+    assert archivo.archivar_ventas(db, limite=datetime(2021, 1, 1)) == 1
+    assert (directorio_archivo / "ventas-2020-05.jsonl.gz").exists()
+    assert db.get(models.Venta, venta["id_venta"]) is None
+    assert db.query(models.DetalleVenta).filter(
+        models.DetalleVenta.id_venta == venta["id_venta"]).count() == 0
+    assert db.get(models.Venta, reciente["id_venta"]) is not None
+
+    assert archivo.leer_venta_archivada(venta["id_venta"]) == venta
+    assert archivo.leer_venta_archivada(reciente["id_venta"]) is None
+
+    respuesta = client.get(f"/ventas/{venta['id_venta']}", headers=comprador)
+    assert respuesta.status_code == 200
+    assert respuesta.json() == venta
+
+
+def test_limite_archivo():
+    assert archivo.limite_archivo(12, datetime(2025, 3, 15)) == datetime(
+        2024, 3, 1, tzinfo=archivo.timezone.utc)
+    assert archivo.limite_archivo(3, datetime(2025, 2, 1)) == datetime(
+        2024, 11, 1, tzinfo=archivo.timezone.utc)
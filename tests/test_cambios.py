@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from app import models
+from app.routes.productos import _fecha_a_token
+
+# Token anterior a todas las fechas preparadas como "recientes" en las pruebas
+TOKEN = _fecha_a_token(datetime(2021, 1, 1))
+
+
+def _envejecer(db, *productos):
+    """Marca los productos como modificados por última vez en 2020"""
+    for producto in productos:
+        producto.fecha_actualizacion = datetime(2020, 1, 1)
+    db.commit()
+
+
+def _crear_producto(db, nombre):
+    producto = models.Producto(nombre=nombre, precio=1.0, stock=10)
+    db.add(producto)
+    db.commit()
+    return producto
+
+
+def test_primera_sincronizacion(client, crear_usuario, producto):
+    headers = crear_usuario("cajero")
+    respuesta = client.get("/productos/cambios", headers=headers)
+    assert respuesta.status_code == 200
+    resultado = respuesta.json()
+    assert [p["id_producto"] for p in resultado["actualizados"]] == [producto.id_producto]
+    assert resultado["eliminados"] == []
+    assert int(resultado["token"]) > int(TOKEN)
+
+
+def test_cambios_desde_token(client, db, crear_usuario, producto):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    otro = _crear_producto(db, "Pan")
+    _envejecer(db, producto, otro)
+
+    respuesta = client.put(f"/productos/{otro.id_producto}", headers=admin, json={
+        "nombre": "Pan integral", "precio": 2.0, "stock": 10})
+    assert respuesta.status_code == 200
+
+    resultado = client.get("/productos/cambios", headers=admin,
+                           params={"desde": TOKEN}).json()
+    assert [p["nombre"] for p in resultado["actualizados"]] == ["Pan integral"]
+    assert resultado["eliminados"] == []
+    assert int(resultado["token"]) >= int(TOKEN)
+
+
+def test_producto_eliminado(client, db, crear_usuario, producto):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    otro = _crear_producto(db, "Pan")
+    id_otro = otro.id_producto
+    _envejecer(db, producto, otro)
+
+    assert client.delete(f"/productos/{id_otro}", headers=admin).status_code == 200
+
+    resultado = client.get("/productos/cambios", headers=admin,
+                           params={"desde": TOKEN}).json()
+    assert resultado["actualizados"] == []
+    assert resultado["eliminados"] == [id_otro]
+
+
+def test_venta_actualiza_stock(client, db, crear_usuario, producto):
+    comprador = crear_usuario("cajero")
+    _envejecer(db, producto)
+
+    respuesta = client.post("/ventas/", headers=comprador, json={"detalles": [
+        {"id_producto": producto.id_producto, "cantidad": 5, "precio_unitario": 7.5}
+    ]})
+    assert respuesta.status_code == 200
+
+    resultado = client.get("/productos/cambios", headers=comprador,
+                           params={"desde": TOKEN}).json()
+    assert [(p["id_producto"], p["stock"]) for p in resultado["actualizados"]] == [
+        (producto.id_producto, 45)]
+
+
+def test_token_invalido(client, crear_usuario):
+    headers = crear_usuario("cajero")
+    respuesta = client.get("/productos/cambios", headers=headers,
+                           params={"desde": "abc"})
+    assert respuesta.status_code == 400
@@ -0,0 +1,61 @@
+from app import models
+
+
+def _crear_venta(client, headers, producto, cantidad=2):
+    respuesta = client.post("/ventas/", headers=headers, json={"detalles": [
+        {"id_producto": producto.id_producto, "cantidad": cantidad,
+         "precio_unitario": producto.precio}
+    ]})
+    assert respuesta.status_code == 200
+    return respuesta.json()
+
+
+def test_productos_con_campos(client, crear_usuario, producto):
+    headers = crear_usuario("cajero")
+    respuesta = client.get(
+        "/productos/?fields=id_producto,nombre,precio,stock", headers=headers)
+    assert respuesta.status_code == 200
+    assert respuesta.json() == [{"id_producto": producto.id_producto, "nombre": "Leche",
+                                 "precio": 7.5, "stock": 50}]
+
+
+def test_campo_invalido(client, crear_usuario):
+    headers = crear_usuario("cajero")
+    respuesta = client.get("/productos/?fields=nombre,contraseña", headers=headers)
+    assert respuesta.status_code == 400
+
+
+def test_ventas_con_campos_sin_detalles(client, crear_usuario, producto):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    venta = _crear_venta(client, admin, producto)
+
+    respuesta = client.get("/ventas/?fields=id_venta,total", headers=admin)
+    assert respuesta.status_code == 200
+    assert respuesta.json() == [{"id_venta": venta["id_venta"], "total": 15.0}]
+
+    respuesta = client.get("/ventas/?detalles=false", headers=admin)
+    assert respuesta.status_code == 200
+    assert "detalles" not in respuesta.json()[0]
+    assert respuesta.json()[0]["id_usuario"] == venta["id_usuario"]
+
+
+def test_ventas_con_campos_y_detalles(client, crear_usuario, producto):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    comprador = crear_usuario("cajero")
+    venta = _crear_venta(client, comprador, producto)
+
+    respuesta = client.get("/ventas/?fields=id_venta,detalles", headers=admin)
+    assert respuesta.status_code == 200
+    [item] = respuesta.json()
+    assert set(item) == {"id_venta", "detalles"}
+    assert item["detalles"] == venta["detalles"]
+    assert item["detalles"][0]["subtotal"] == 15.0
+
+    respuesta = client.get(
+        "/ventas/mis-ventas?fields=id_venta,detalles", headers=comprador)
+    assert respuesta.status_code == 200
+    assert respuesta.json() == [item]
+
+    respuesta = client.get(
+        "/ventas/?fields=id_venta,detalles&detalles=false", headers=admin)
+    assert respuesta.json() == [{"id_venta": venta["id_venta"]}]
@@ -0,0 +1,148 @@
+import asyncio
+
+from app import models
+from app.eventos import SSE_RESET, CentroEventos, centro_eventos, formato_sse
+
+
+def _eventos_durante(accion):
+    """Ejecuta `accion` con un suscriptor activo y devuelve sus eventos pendientes"""
+    async def escenario():
+        suscriptor = centro_eventos.suscribir()
+        try:
+            resultado = accion()
+            return resultado, list(suscriptor.pendientes.values())
+        finally:
+            centro_eventos.desuscribir(suscriptor)
+
+    return asyncio.run(escenario())
+
+
+def test_crear_y_actualizar_producto_publican_eventos(client, crear_usuario):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    datos = {"nombre": "Pan", "precio": 1.5, "stock": 20}
+
+    respuesta, eventos = _eventos_durante(
+        lambda: client.post("/productos/", headers=admin, json=datos))
+    assert respuesta.status_code == 200
+    producto = respuesta.json()
+    assert [(e["id_producto"], e["tipo"]) for e in eventos] == [
+        (producto["id_producto"], "actualizado")]
+    assert eventos[0]["datos"]["stock"] == 20
+
+    respuesta, eventos = _eventos_durante(lambda: client.put(
+        f"/productos/{producto['id_producto']}", headers=admin,
+        json={**datos, "precio": 2.0}))
+    assert respuesta.status_code == 200
+    assert len(eventos) == 1
+    assert eventos[0]["datos"]["precio"] == 2.0
+
+
+def test_venta_publica_stock(client, crear_usuario, producto):
+    comprador = crear_usuario("cajero")
+
+    respuesta, eventos = _eventos_durante(lambda: client.post(
+        "/ventas/", headers=comprador, json={"detalles": [
+            {"id_producto": producto.id_producto, "cantidad": 4, "precio_unitario": 7.5}
+        ]}))
+    assert respuesta.status_code == 200
+    assert [(e["id_producto"], e["tipo"], e["datos"]) for e in eventos] == [
+        (producto.id_producto, "stock", {"stock": 46})]
+
+
+def test_actualizacion_y_venta_se_combinan(client, crear_usuario, producto):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    ultimo_id = centro_eventos.epoca + "-" + str(centro_eventos._ultimo_id)
+
+    def actualizar_y_vender():
+        client.put(f"/productos/{producto.id_producto}", headers=admin, json={
+            "nombre": "Leche", "precio": 9.9, "stock": 50})
+        return client.post("/ventas/", headers=admin, json={"detalles": [
+            {"id_producto": producto.id_producto, "cantidad": 1, "precio_unitario": 9.9}
+        ]})
+
+    respuesta, eventos = _eventos_durante(actualizar_y_vender)
+    assert respuesta.status_code == 200
+    [evento] = eventos
+    assert evento["tipo"] == "actualizado"
+    assert (evento["datos"]["precio"], evento["datos"]["stock"]) == (9.9, 49)
+
+    # Al reanudar desde Last-Event-ID se reciben los mismos datos combinados
+    async def reanudar():
+        suscriptor = centro_eventos.suscribir(ultimo_id)
+        centro_eventos.desuscribir(suscriptor)
+        return list(suscriptor.pendientes.values())
+
+    assert asyncio.run(reanudar()) == [evento]
+
+
+def _con_centro(escenario, **opciones):
+    return asyncio.run(escenario(CentroEventos(**opciones)))
+
+
+def test_formato_sse():
+    centro = CentroEventos()
+    centro.publicar(7, "stock", {"stock": 3})
+    evento = centro._historial[-1]
+    assert formato_sse(evento) == (
+        f"id: {centro.epoca}-1\nevent: producto\n"
+        'data: {"id_producto": 7, "tipo": "stock", "stock": 3}\n\n')
+    assert SSE_RESET == "event: reset\ndata: {}\n\n"
+
+
+def test_reanudar_desde_ultimo_id():
+    async def escenario(centro):
+        for id_producto in (1, 2, 3):
+            centro.publicar(id_producto, "stock", {"stock": id_producto})
+        suscriptor = centro.suscribir(f"{centro.epoca}-1")
+        return await centro.esperar(suscriptor, timeout=1)
+
+    reiniciar, eventos = _con_centro(escenario)
+    assert not reiniciar
+    assert [e["id_producto"] for e in eventos] == [2, 3]
+
+
+def test_reanudar_fuera_del_historial():
+    async def escenario(centro):
+        for id_producto in (1, 2, 3, 4):
+            centro.publicar(id_producto, "stock", {"stock": 0})
+        suscriptor = centro.suscribir(f"{centro.epoca}-1")
+        return await centro.esperar(suscriptor, timeout=1)
+
+    assert _con_centro(escenario, historial=2) == (True, [])
+
+
+def test_reanudar_con_otra_epoca():
+    async def escenario(centro):
+        centro.publicar(1, "stock", {"stock": 0})
+        suscriptor = centro.suscribir("1-1")
+        return await centro.esperar(suscriptor, timeout=1)
+
+    assert _con_centro(escenario) == (True, [])
+
+
+def test_desborde_del_buffer():
+    async def escenario(centro):
+        suscriptor = centro.suscribir()
+        for id_producto in (1, 2, 3):
+            centro.publicar(id_producto, "stock", {"stock": 0})
+        primero = await centro.esperar(suscriptor, timeout=1)
+        centro.publicar(4, "stock", {"stock": 0})
+        segundo = await centro.esperar(suscriptor, timeout=1)
+        return primero, segundo
+
+    (reiniciar, eventos), (reiniciar_despues, eventos_despues) = _con_centro(
+        escenario, capacidad=2)
+    assert reiniciar and eventos == []
+    assert not reiniciar_despues
+    assert [e["id_producto"] for e in eventos_despues] == [4]
+
+
+def test_eliminado_reemplaza_pendiente():
+    async def escenario(centro):
+        suscriptor = centro.suscribir()
+        centro.publicar(1, "actualizado", {"precio": 2.0})
+        centro.publicar(1, "eliminado")
+        return await centro.esperar(suscriptor, timeout=1)
+
+    reiniciar, [evento] = _con_centro(escenario)
+    assert (evento["tipo"], evento["datos"]) == ("eliminado", {})
@@ -0,0 +1,58 @@
+from passlib.hash import bcrypt
+
+from app import calibrar_hash, dependencies, models
+
+
+def _usuario_con_costo(db, rondas):
+    usuario = models.Usuario(
+        nombre_usuario="cajero",
+        contraseña=bcrypt.using(rounds=rondas).hash("secreta"),
+        rol=models.RolUsuario.comprador,
+        nombre_completo="Cajero",
+        correo="cajero@example.com"
+    )
+    db.add(usuario)
+    db.commit()
+    return usuario
+
+
+def _costo(hash_guardado):
+    return int(hash_guardado.split("$")[2])
+
+
+def test_login_regenera_hash_con_otro_costo(client, db):
+    usuario = _usuario_con_costo(db, dependencies.BCRYPT_ROUNDS + 1)
+
+    respuesta = client.post(
+        "/login", json={"nombre_usuario": "cajero", "contraseña": "secreta"})
+    assert respuesta.status_code == 200
+
+    db.refresh(usuario)
+    assert _costo(usuario.contraseña) == dependencies.BCRYPT_ROUNDS
+    assert dependencies.verify_password("secreta", usuario.contraseña)
+
+
+def test_login_fallido_no_cambia_hash(client, db):
+    usuario = _usuario_con_costo(db, dependencies.BCRYPT_ROUNDS + 1)
+    hash_original = usuario.contraseña
+
+    respuesta = client.post(
+        "/login", json={"nombre_usuario": "cajero", "contraseña": "incorrecta"})
+    assert respuesta.status_code == 401
+
+    db.refresh(usuario)
+    assert usuario.contraseña == hash_original
+
+
+def test_calibrar_elige_mayor_costo_dentro_del_objetivo(monkeypatch):
+    tiempos = {10: 60.0, 11: 120.0, 12: 240.0, 13: 480.0}
+    monkeypatch.setattr(calibrar_hash, "medir_verificacion", tiempos.get)
+
+    assert calibrar_hash.calibrar(250, min_rondas=10, max_rondas=13) == 12
+    assert calibrar_hash.calibrar(1000, min_rondas=10, max_rondas=13) == 13
+    # Nunca baja del mínimo, aunque el objetivo sea inalcanzable
+    assert calibrar_hash.calibrar(10, min_rondas=10, max_rondas=13) == 10
+
+
+def test_medir_verificacion():
+    assert calibrar_hash.medir_verificacion(4, repeticiones=1) > 0
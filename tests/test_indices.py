@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import Base
+from app.routes.ventas import _filtrar_fechas
+
+
+@pytest.fixture
+def db_postgres(postgres_url):
+    """Base de datos poblada en un esquema temporal que se elimina al terminar"""
+    esquema = f"pruebas_{uuid.uuid4().hex[:8]}"
+    engine = create_engine(
+        postgres_url, connect_args={"options": f"-csearch_path={esquema}"})
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {esquema}"))
+    try:
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO usuarios (nombre_usuario, contraseña, rol, nombre_completo, correo)
+                SELECT 'usuario' || i, 'x', 'comprador', 'Usuario', 'usuario' || i || '@example.com'
+                FROM generate_series(1, 200) AS i
+            """))
+            conn.execute(text("""
+                INSERT INTO productos (nombre, precio, stock)
+                SELECT 'producto' || i, 1.0, 100 FROM generate_series(1, 50) AS i
+            """))
+            conn.execute(text("""
+                INSERT INTO ventas (id_usuario, fecha_venta, total)
+                SELECT i % 200 + 1, timestamptz '2024-01-01' + i * interval '30 minutes', 10.0
+                FROM generate_series(1, 20000) AS i
+            """))
+            conn.execute(text("""
+                INSERT INTO detalle_ventas (id_venta, id_producto, cantidad, precio_unitario)
+                SELECT v.id_venta, v.id_venta % 50 + 1, 1, 5.0
+                FROM ventas AS v, generate_series(1, 2)
+            """))
+            conn.execute(text("ANALYZE"))
+
+        session = Session(engine)
+        yield session
+        session.close()
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {esquema} CASCADE"))
+        engine.dispose()
+
+
+def _plan(db, query) -> str:
+    compilado = query.statement.compile(dialect=db.bind.dialect)
+    filas = db.connection().exec_driver_sql(
+        f"EXPLAIN {compilado}", compilado.params)
+    return "\n".join(fila[0] for fila in filas)
+
+
+def test_mis_ventas_usa_indice_compuesto(db_postgres):
+    query = db_postgres.query(models.Venta).filter(
+        models.Venta.id_usuario == 7).offset(0).limit(100)
+    assert "ix_ventas_id_usuario_fecha_venta" in _plan(db_postgres, query)
+
+
+def test_mis_ventas_por_fechas_usa_indice_compuesto(db_postgres):
+    query = db_postgres.query(models.Venta).filter(models.Venta.id_usuario == 7)
+    query = _filtrar_fechas(query,
+                            datetime(2024, 3, 1, tzinfo=timezone.utc),
+                            datetime(2024, 4, 1, tzinfo=timezone.utc))
+    assert "ix_ventas_id_usuario_fecha_venta" in _plan(
+        db_postgres, query.offset(0).limit(100))
+
+
+def test_carga_de_detalles_usa_indice(db_postgres):
+    query = db_postgres.query(models.DetalleVenta).filter(
+        models.DetalleVenta.id_venta.in_(list(range(100, 110))))
+    assert "ix_detalle_ventas_id_venta" in _plan(db_postgres, query)
@@ -0,0 +1,33 @@
+from app.routes import productos as rutas_productos
+
+
+def test_productos_batch_en_orden(client, crear_usuario, producto):
+    headers = crear_usuario("cajero")
+    ids = [999, producto.id_producto, 998, producto.id_producto]
+    respuesta = client.get("/productos/batch", headers=headers,
+                           params={"ids": ids})
+    assert respuesta.status_code == 200
+    resultado = respuesta.json()
+
+    assert [r["id_producto"] for r in resultado] == ids
+    assert [r["encontrado"] for r in resultado] == [False, True, False, True]
+    assert resultado[0]["producto"] is None
+    assert resultado[1]["producto"]["nombre"] == "Leche"
+    assert resultado[3] == resultado[1]
+
+
+def test_productos_batch_limite(client, crear_usuario, monkeypatch):
+    headers = crear_usuario("cajero")
+    monkeypatch.setattr(rutas_productos, "MAX_PRODUCTOS_LOTE", 3)
+    respuesta = client.get("/productos/batch", headers=headers,
+                           params={"ids": [1, 2, 3, 4]})
+    assert respuesta.status_code == 400
+
+
+def test_productos_batch_no_es_un_id(client, crear_usuario):
+    headers = crear_usuario("cajero")
+    # Sin ids la ruta /batch responde 422 por el parámetro faltante,
+    # no el 422 de /{producto_id} por un ID no numérico
+    respuesta = client.get("/productos/batch", headers=headers)
+    assert respuesta.status_code == 422
+    assert respuesta.json()["detail"][0]["loc"] == ["query", "ids"]
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import dependencies, models
+
+
+def _usuario(nombre, correo=None):
+    return {"nombre_usuario": nombre, "nombre_completo": nombre.title(),
+            "correo": correo or f"{nombre}@example.com", "contraseña": "secreta"}
+
+
+def test_registro_lote(client, db, crear_usuario):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    crear_usuario("existente")
+
+    respuesta = client.post("/registro-lote", headers=admin, json={"usuarios": [
+        _usuario("cajero1"),
+        _usuario("existente", "otro@example.com"),
+        _usuario("cajero2"),
+        _usuario("cajero3", "cajero1@example.com"),
+    ]})
+    assert respuesta.status_code == 200
+    resultado = respuesta.json()
+
+    assert [u["nombre_usuario"] for u in resultado["creados"]] == ["cajero1", "cajero2"]
+    assert all(u["rol"] == "comprador" for u in resultado["creados"])
+    assert [(c["indice"], c["detalle"]) for c in resultado["conflictos"]] == [
+        (1, "Nombre de usuario ya registrado"),
+        (3, "Correo electrónico ya registrado"),
+    ]
+
+    cajero = db.query(models.Usuario).filter(
+        models.Usuario.nombre_usuario == "cajero2").one()
+    assert dependencies.verify_password("secreta", cajero.contraseña)
+
+
+def test_registro_lote_requiere_administrador(client, crear_usuario):
+    comprador = crear_usuario("cajero")
+    respuesta = client.post("/registro-lote", headers=comprador,
+                            json={"usuarios": [_usuario("nuevo")]})
+    assert respuesta.status_code == 403
+
+
+def test_registro_comprador(client):
+    respuesta = client.post("/registro-comprador", json=_usuario("cajero"))
+    assert respuesta.status_code == 200
+    assert respuesta.json()["rol"] == "comprador"
+
+
+def test_registro_comprador_nombre_duplicado(client, crear_usuario):
+    crear_usuario("cajero")
+    respuesta = client.post("/registro-comprador",
+                            json=_usuario("cajero", "nuevo@example.com"))
+    assert respuesta.status_code == 400
+    assert "registrado" in respuesta.json()["detail"]
+
+
+def test_registro_comprador_correo_duplicado(client, crear_usuario):
+    crear_usuario("cajero")
+    respuesta = client.post("/registro-comprador",
+                            json=_usuario("nuevo", "cajero@example.com"))
+    assert respuesta.status_code == 400
+    assert "registrado" in respuesta.json()["detail"]
+
+
+def test_registro_comprador_usa_nombre_de_restriccion(client, monkeypatch):
+    error = SimpleNamespace(diag=SimpleNamespace(constraint_name="usuarios_correo_key"))
+
+    def commit_fallido(self):
+        raise IntegrityError("INSERT", {}, error)
+
+    monkeypatch.setattr(Session, "commit", commit_fallido)
+    respuesta = client.post("/registro-comprador", json=_usuario("cajero"))
+    assert respuesta.status_code == 400
+    assert respuesta.json()["detail"] == "Correo electrónico ya registrado"
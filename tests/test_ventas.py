@@ -0,0 +1,39 @@
+from app import models
+from app.routes.ventas import cache_ventas
+
+
+def test_leer_venta_con_cache(client, crear_usuario, producto):
+    comprador = crear_usuario("cajero")
+    otro = crear_usuario("otro")
+    venta = client.post("/ventas/", headers=comprador, json={"detalles": [
+        {"id_producto": producto.id_producto, "cantidad": 2, "precio_unitario": 7.5}
+    ]}).json()
+    url = f"/ventas/{venta['id_venta']}"
+
+    respuesta = client.get(url, headers=comprador)
+    assert respuesta.status_code == 200
+    assert respuesta.json() == venta
+    etag = respuesta.headers["etag"]
+    assert etag.startswith('W/"')
+    assert "immutable" in respuesta.headers["cache-control"]
+
+    respuesta = client.get(url, headers={**comprador, "If-None-Match": etag})
+    assert respuesta.status_code == 304
+    assert respuesta.headers["etag"] == etag
+
+    # Comparación débil: coincide con o sin el prefijo W/
+    sin_prefijo = etag.removeprefix("W/")
+    respuesta = client.get(
+        url, headers={**comprador, "If-None-Match": f'"otro", {sin_prefijo}'})
+    assert respuesta.status_code == 304
+
+    respuesta = client.get(url, headers={**otro, "If-None-Match": etag})
+    assert respuesta.status_code == 403
+
+    estadisticas = cache_ventas.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (3, 1)
+
+
+def test_leer_venta_inexistente(client, crear_usuario):
+    admin = crear_usuario("admin", models.RolUsuario.administrador)
+    assert client.get("/ventas/999", headers=admin).status_code == 404